@@ -259,24 +259,51 @@ class Column:
 
         :return dict
         """
-        if self.data_is_numeric():
-            return {
+        is_numeric = self.data_is_numeric()
+        if self._cache.cache_output:
+            # each aggregate is cached under its own query, so reuse them instead of scanning the table again
+            out = {
                 'len': self.len,
                 'count': self.count(),
                 'min': self.min(),
-                'max': self.max(),
-                'sum': self.sum(),
-                'avg': self.avg(),
-                'median': self.median()
+                'max': self.max()
             }
+            if is_numeric:
+                out.update(sum=self.sum(), avg=self.avg())
         else:
-            return {
-                'len': self.len,
-                'count': self.count(),
-                'min': self.min(),
-                'max': self.max(),
-                'unique': len(self.unique())
-            }
+            out = self._describe_bulk(numeric=is_numeric)
+
+        if is_numeric:
+            out['median'] = self.median()
+        else:
+            out['unique'] = len(self.unique())
+        return out
+
+    def _describe_bulk(self, numeric: bool) -> dict[str, str | int | float]:
+        """
+        Get the aggregates for Column.describe() in a single SQL query
+
+        Instead of running one query for each aggregate (len, count, min, max...),
+        all of them are selected at once, the median and unique values are left out
+        because they need their own query.
+        It's only used when the output isn't cached, otherwise the single queries are served from the cache.
+
+        if column data is numeric return a dictionary with keys:
+        {'len', 'count', 'min', 'max', 'sum', 'avg'}
+        if its text data:
+        {'len', 'count', 'min', 'max'}
+
+        :param numeric: bool, result of Column.data_is_numeric() (passed in so it isn't queried twice)
+        :return dict
+        """
+        keys = ['len', 'count', 'min', 'max']
+        aggregates = f'COUNT(*), COUNT({self.name}), MIN({self.name}), MAX({self.name})'
+        if numeric:
+            keys += ['sum', 'avg']
+            aggregates += f', SUM({self.name}), AVG({self.name})'
+
+        row = self._cache.execute(f'SELECT {aggregates} FROM {self.table}')[0]
+        return dict(zip(keys, row))
 
     def unique(self) -> list[ColumnValue]:
         """
@@ -21,7 +21,8 @@ class Database:
     You can have a look at the README here: https://github.com/shner-elmo/pandas-db/blob/master/README.md
     """
     def __init__(self, db_path: str, cache: bool = True, populate_cache: bool = False,
-                 max_item_size: int = 2, max_dict_size: int = 100) -> None:
+                 max_item_size: int = 2, max_dict_size: int = 100,
+                 read_only: bool = False, immutable: bool = False) -> None:
         """
         Initialize the Database object
 
@@ -46,11 +47,21 @@ class Database:
         max_dict_size: the max size of the whole cache-dictionary, if the dictionary reaches its max size,
         no item will be added.
 
+        There are also two optional parameters for how the database file is opened:
+
+        read_only: if True the file is opened with `mode=ro`, and any statement that writes to it will fail
+        (temporary views and tables can still be created).
+
+        immutable: if True the file is opened with `mode=ro&immutable=1`, so SQLite doesn't take any locks
+        and doesn't check for changes, only use it when the file is not modified while the connection is open.
+
         :param db_path: str, path to database
         :param cache: bool, default True
         :param populate_cache: bool, default True
         :param max_item_size: int, size in MB
         :param max_dict_size: int, size in MB
+        :param read_only: bool, default False
+        :param immutable: bool, default False
         """
         self.db_path = db_path  # save for repr()
         db_path = Path(db_path)
@@ -73,9 +84,16 @@ class Database:
                 local_db_folder.mkdir()
 
             convert_sql_to_db(sql_file=db_path, db_file=local_db_file)
-            self.conn = sqlite3.connect(local_db_file, check_same_thread=False)
+            db_file: Path = local_db_file
         else:
-            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            db_file = Path(db_path)
+
+        if read_only or immutable:
+            params = 'mode=ro&immutable=1' if immutable else 'mode=ro'
+            uri = f'{db_file.resolve().as_uri()}?{params}'
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(db_file, check_same_thread=False)
 
         self.cache = Cache(
             conn=self.conn,
@@ -180,13 +198,41 @@ class Database:
         with self.conn as cursor:
             data = cursor.execute(sql_query)
 
-        cols = [x[0] for x in data.description]
+        cols = self._get_col_names(data, rename_duplicates=rename_duplicates)
+        return DataFrame(data=data, columns=cols)
+
+    def query_columns(self, sql_query: str, rename_duplicates: bool = True) -> list[str]:
+        """
+        Return the names of the columns the query returns, without fetching any of its rows
+
+        The names are the same as the columns of the DataFrame returned by Database.query()
+
+        :param sql_query: str, SQL query
+        :param rename_duplicates: bool, default: True
+        :return: list with column names
+        """
+        with self.conn as cursor:
+            data = cursor.execute(sql_query)
+
+        cols = self._get_col_names(data, rename_duplicates=rename_duplicates)
+        data.close()
+        return cols
+
+    @staticmethod
+    def _get_col_names(cursor: sqlite3.Cursor, rename_duplicates: bool) -> list[str]:
+        """
+        Get the column names from the description of an executed cursor
+
+        :param cursor: sqlite3.Cursor
+        :param rename_duplicates: bool, if True a number will be added to the duplicated names
+        :return: list with column names
+        """
+        cols = [x[0] for x in cursor.description]
 
         if rename_duplicates:
             if len(set(cols)) != len(cols):
                 cols = rename_duplicate_cols(cols)
-
-        return DataFrame(data=data, columns=cols)
+        return cols
 
     def __enter__(self) -> 'Database':
         """
@@ -0,0 +1,41 @@
+import unittest
+import re
+from typing import Callable, Any
+
+from pandasdb import Database
+
+
+BAD_INDEX_PATTERN = re.compile(r'^Index must be of type: int, list, or slice\. not: ')
+
+
+def drop_temp_views(db: Database, keep: set[str]) -> None:
+    """
+    Drop all the temporary views that aren't in `keep`
+
+    The Database is shared between the tests of a class, so each test drops the views it created.
+
+    :param db: Database
+    :param keep: set, names of the temporary views to keep
+    :return: None
+    """
+    views = set(db.temp_views) - keep
+    with db.conn as cursor:
+        for view in views:
+            cursor.execute(f'DROP VIEW {view}')
+
+
+def assert_bad_type(test: unittest.TestCase, pattern: re.Pattern, func: Callable[[Any], Any], arg: Any) -> None:
+    """
+    Assert that `func(arg)` raises a TypeError with a message that matches `pattern` and ends with the type of `arg`
+
+    :param test: TestCase, to run the assertions with
+    :param pattern: Pattern, compiled regex for the start of the error message
+    :param func: Callable, for ex: `iloc.__getitem__`
+    :param arg: Any, argument of the wrong type
+    :return: None
+    """
+    with test.assertRaises(TypeError) as cm:
+        func(arg)
+    msg = str(cm.exception)
+    test.assertRegex(msg, pattern)
+    test.assertTrue(msg.endswith(str(type(arg))), msg=msg)
@@ -16,8 +16,8 @@ class TestCacheDict(unittest.TestCase):
         self.cache = CacheDict()
 
     def test_init(self):
-        self.assertTrue(isinstance(self.cache, CacheDict))
-        self.assertTrue(isinstance(self.cache, dict))
+        self.assertIsInstance(self.cache, CacheDict)
+        self.assertIsInstance(self.cache, dict)
 
     def test_setitem(self):
         types = [dict(), set(), tuple(), list(),  3, 3.32, None, True]
@@ -62,23 +62,26 @@ class TestCacheDict(unittest.TestCase):
 
 
 class TestCache(unittest.TestCase):
-    def setUp(self) -> None:
-        self.conn = sqlite3.connect(DB_FILE)
-
-        self.db = Database(DB_FILE)
-        table = self.db.tables[0]
-        column = self.db[table].columns[0]
-        self.table = self.db[table]
-        self.queries = [
+    @classmethod
+    def setUpClass(cls) -> None:
+        # the tests only read from the database, so the connections are opened once for the whole class
+        cls.conn = sqlite3.connect(DB_FILE)
+
+        cls.db = Database(DB_FILE)
+        table = cls.db.tables[0]
+        column = cls.db[table].columns[0]
+        cls.table = cls.db[table]
+        cls.queries = [
             f'SELECT MIN({column}) FROM {table}',
             f'SELECT MAX({column}) FROM {table}',
             f'SELECT COUNT({column}) FROM {table}',
             f'SELECT COUNT(*) FROM {table} WHERE {column} IS NULL'
         ]
 
-    def tearDown(self) -> None:
-        self.conn.close()
-        self.db.exit()
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.conn.close()
+        cls.db.exit()
 
     def test_init(self):
         cache = Cache(conn=self.conn, cache_output=False)
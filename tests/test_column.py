@@ -3,141 +3,276 @@ import numpy as np
 
 import unittest
 import random
-from collections.abc import Generator
+import re
+import sqlite3
+import functools
+from collections.abc import Generator, Iterable
+from itertools import islice
+from typing import Callable, Any
 
 from pandasdb import Database
 from pandasdb.table import Table
 from pandasdb.column import Column, ColumnView
 from pandasdb.expression import Expression
-from pandasdb.utils import sort_iterable_with_none_values, get_random_name, convert_type_to_sql, col_iterator
+from pandasdb.utils import get_random_name, convert_type_to_sql, col_iterator
+
+from tests.helpers import BAD_INDEX_PATTERN, assert_bad_type, drop_temp_views
 
 DB_FILE = '../data/forestation.db'
 
+BAD_ITEM_PATTERN = re.compile(r'^Argument must be of type Expression, int, slice, or list\. not: ')
+
+# the tests only read from the Database, so keep as many pages as possible in memory
+PRAGMAS = (
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -65536',  # 64 MB
+    'PRAGMA mmap_size = 268435456',  # 256 MB
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_series(key: tuple[str, str, str]) -> Series:
+    """
+    Load the data of a column into a Series, the result is cached so each column is read only once
+
+    The Database is read-only throughout the tests, so the cache is cleared only in `tearDownModule()`.
+
+    :param key: tuple, (table_name, column_name, column_query)
+    :return: Series
+    """
+    _, name, query = key
+    conn = sqlite3.connect(DB_FILE)
+    try:
+        return Series(data=[tup[0] for tup in conn.execute(query)], name=name)
+    finally:
+        conn.close()
+
+
+def cached_series(col: Column) -> Series:
+    """ Get the (cached) Series for a column of a table in DB_FILE """
+    return _load_series((col.table, col.name, col.query))
+
+
+def tearDownModule() -> None:
+    _load_series.cache_clear()
+
+
+def get_counts(col: Column) -> tuple[int, int, int]:
+    """
+    Get the length, count, and null-count of a column with a single query
+
+    :param col: Column
+    :return: tuple, (len, count, null_count)
+    """
+    with col.conn as cursor:
+        length, count = cursor.execute(f'SELECT COUNT(*), COUNT({col.name}) FROM {col.table}').fetchone()
+    return length, count, length - count
+
+
+def partition_columns(db: Database) -> tuple[list[Column], list[Column]]:
+    """
+    Split all the columns in the Database by their data type
+
+    :param db: Database
+    :return: tuple, (numeric_columns, text_columns)
+    """
+    numeric_cols, text_cols = [], []
+    for col in col_iterator(db):
+        if col.data_is_numeric():
+            numeric_cols.append(col)
+        else:
+            text_cols.append(col)
+    return numeric_cols, text_cols
+
+
+def get_series_stats(ser: Series, numeric: bool) -> dict[str, Any]:
+    """
+    Compute all the statistics the tests compare against from a column's Series
+
+    :param ser: Series
+    :param numeric: bool, if True add the keys: 'sum', 'mean', and 'median'
+    :return: dict
+    """
+    nn = ser[ser.notnull()]  # filter None values as Pandas isn't able to compare between them
+    stats = {
+        'len': len(ser),
+        'count': ser.count(),
+        'min': nn.min(),
+        'max': nn.max(),
+        'unique': ser.unique(),
+        'value_counts': ser.value_counts().to_dict()
+    }
+    if numeric:
+        stats.update(sum=ser.sum(), mean=ser.mean(), median=ser.median())
+    return stats
+
+
+def not_null_array(it: Iterable) -> np.ndarray:
+    """ Get a float array with the values of the iterable, without the None values """
+    return np.fromiter((x for x in it if x is not None), dtype=float)
+
+
+def set_pragmas(db: Database) -> None:
+    """ Run the PRAGMA statements in `PRAGMAS` on the Database connection """
+    with db.conn as cursor:
+        for pragma in PRAGMAS:
+            cursor.execute(pragma)
+
 
 class TestColumn(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.db = Database(DB_FILE, cache=False)
+        set_pragmas(cls.db)
+        cls.table: Table = cls.db[cls.db.tables[0]]
+        column = cls.table.columns[0]
+        cls.column: Column = cls.table[column]
+        cls.numeric_cols, cls.text_cols = partition_columns(cls.db)
+        cls.series_stats = {
+            (col.table, col.name): get_series_stats(cached_series(col), numeric=col.data_is_numeric())
+            for col in cls.numeric_cols + cls.text_cols
+        }
+        cls.column_values = set(cls.column)  # for test_sample()
+        cls.country_names = set(cls.db.forest_area.country_name)  # for test_filter() and test_getitem()
+
+        # one PRAGMA and one COUNT(*) per table, shared by all of its columns (for test_sql_type() and test_len())
+        with cls.db.conn as cursor:
+            cls.sql_types = {
+                (table, row[1]): row[2]
+                for table in cls.db.tables
+                for row in cursor.execute(f"PRAGMA table_info('{table}')")
+            }
+            cls.table_rows = {
+                table: cursor.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                for table in cls.db.tables
+            }
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.db.exit()
+
     def setUp(self) -> None:
-        self.db = Database(DB_FILE, cache=False)
-        self.table: Table = self.db[self.db.tables[0]]
-        column = self.table.columns[0]
-        self.column: Column = self.table[column]
+        self.temp_views = set(self.db.temp_views)
 
     def tearDown(self) -> None:
-        self.db.exit()
+        drop_temp_views(self.db, keep=self.temp_views)
 
     def test_type(self):
         for col in col_iterator(self.db):
-            out = col.type
-            self.assertIsInstance(out, type)
-            self.assertIn(out, (str, int, float))
+            with self.subTest(table=col.table, col=col.name):
+                out = col.type
+                self.assertIsInstance(out, type)
+                self.assertIn(out, (str, int, float))
 
     def test_sql_type(self):
         for col in col_iterator(self.db):
-            out = col.sql_type
-            self.assertIsInstance(out, str)
-            self.assertGreater(len(out), 0)
+            with self.subTest(table=col.table, col=col.name):
+                out = col.sql_type
+                self.assertIsInstance(out, str)
+                self.assertGreater(len(out), 0)
+                self.assertEqual(out, self.sql_types[col.table, col.name])
 
     def test_data_is_numeric(self):
         for col in col_iterator(self.db):
-            is_numeric = col.data_is_numeric()
-            self.assertIsInstance(is_numeric, bool)
+            with self.subTest(table=col.table, col=col.name):
+                is_numeric = col.data_is_numeric()
+                self.assertIsInstance(is_numeric, bool)
 
-            first_val = next(iter(col))
-            if is_numeric:
-                self.assertIsInstance(first_val, (int, float))
-            else:
-                self.assertIsInstance(first_val, str)
+                first_val = next(iter(col))
+                if is_numeric:
+                    self.assertIsInstance(first_val, (int, float))
+                else:
+                    self.assertIsInstance(first_val, str)
 
     def test_len(self):
         for col in col_iterator(self.db):
-            length = col.len
-            self.assertIsInstance(length, int)
-            self.assertGreaterEqual(length, 0)
+            with self.subTest(table=col.table, col=col.name):
+                length = col.len
+                self.assertIsInstance(length, int)
+                self.assertGreaterEqual(length, 0)
 
-            with self.db.conn as cursor:
-                n_rows = len(cursor.execute(col.query).fetchall())
-
-            self.assertEqual(n_rows, length)
-            self.assertEqual(col.len, col.count() + col.null_count())
+                # all the columns of a table have the same amount of rows
+                self.assertEqual(self.table_rows[col.table], length)
+                self.assertEqual((length, col.count(), col.null_count()), get_counts(col))
 
     def test_count(self):
         for col in col_iterator(self.db):
             out = col.count()
             self.assertIsInstance(out, int)
             self.assertGreater(out, 0)
-            self.assertEqual(col.count() + col.null_count(), col.len)
+
+            length, count, _ = get_counts(col)
+            self.assertEqual(out, count)
+            self.assertEqual(out + col.null_count(), length)
 
     def test_na_count(self):
         for col in col_iterator(self.db):
             out = col.null_count()
             self.assertIsInstance(out, int)
-            self.assertEqual(col.null_count() + col.count(), col.len)
 
-            c = 0
-            for x in col:
-                if x is None:
-                    c += 1
+            length, _, null_count = get_counts(col)
+            self.assertEqual(out, null_count)
+            self.assertEqual(out + col.count(), length)
+
+            c = int(cached_series(col).isna().sum())
             self.assertEqual(c, out)
 
     def test_min(self):
         for col in col_iterator(self.db):
             col_min = col.min()
-            ser = col.to_series()
-            ser_min = ser[ser.notnull()].min()  # filter None values as Pandas isn't able to compare between them
+            ser_min = self.series_stats[col.table, col.name]['min']
             self.assertEqual(ser_min, col_min)
 
     def test_max(self):
         for col in col_iterator(self.db):
             col_max = col.max()
-            ser = col.to_series()
-            ser_max = ser[ser.notnull()].max()  # filter None values as Pandas isn't able to compare between them
+            ser_max = self.series_stats[col.table, col.name]['max']
             self.assertEqual(ser_max, col_max)
 
     def test_sum(self):
-        for col in col_iterator(self.db):
-            if col.data_is_numeric():
-                col_sum = col.sum()
-                ser_sum = col.to_series().sum()
-                self.assertAlmostEqual(ser_sum, col_sum, places=4)  # SQLite SUM() rounds to 4
-            else:
-                self.assertRaisesRegex(
-                    TypeError,
-                    f'Cannot get sum for Column of type {col.type}',
-                    col.sum
-                )
+        for col in self.numeric_cols:
+            col_sum = col.sum()
+            ser_sum = self.series_stats[col.table, col.name]['sum']
+            self.assertAlmostEqual(ser_sum, col_sum, places=4)  # SQLite SUM() rounds to 4
+
+        for col in self.text_cols:
+            self.assertRaisesRegex(
+                TypeError,
+                f'Cannot get sum for Column of type {col.type}',
+                col.sum
+            )
 
     def test_avg(self):
-        for col in col_iterator(self.db):
-            if col.data_is_numeric():
-                col_avg = col.avg()
-                ser_avg = col.to_series().mean()
-                self.assertAlmostEqual(ser_avg, col_avg, places=4)  # round to 4 for consistency
-            else:
-                self.assertRaisesRegex(
-                    TypeError,
-                    f'Cannot get avg for Column of type {col.type}',
-                    col.avg
-                )
+        for col in self.numeric_cols:
+            col_avg = col.avg()
+            ser_avg = self.series_stats[col.table, col.name]['mean']
+            self.assertAlmostEqual(ser_avg, col_avg, places=4)  # round to 4 for consistency
+
+        for col in self.text_cols:
+            self.assertRaisesRegex(
+                TypeError,
+                f'Cannot get avg for Column of type {col.type}',
+                col.avg
+            )
 
     def test_median(self):
-        for col in col_iterator(self.db):
-            if col.data_is_numeric():
-                col_median = col.median()
-                ser_median = col.to_series().median()
-                self.assertAlmostEqual(ser_median, col_median, places=4)
-                self.assertAlmostEqual(ser_median, col_median, places=4)
-
-                # test column slice of len() odd and even
-                even_col = col.limit(4)
-                self.assertAlmostEqual(even_col.median(), even_col.to_series().median(), places=4)
-
-                odd_col = col.limit(5)
-                self.assertAlmostEqual(odd_col.median(), odd_col.to_series().median(), places=4)
-            else:
-                self.assertRaisesRegex(
-                    TypeError,
-                    f'Cannot get median for Column of type {col.type}',
-                    col.median
-                )
+        for col in self.numeric_cols:
+            col_median = col.median()
+            ser_median = self.series_stats[col.table, col.name]['median']
+            self.assertAlmostEqual(ser_median, col_median, places=4)
+            self.assertAlmostEqual(ser_median, col_median, places=4)
+
+            # test column slice of len() odd and even, the expected values both come from a single fetch
+            head = col.iloc[:5]
+            self.assertAlmostEqual(col.limit(4).median(), Series(head[:4]).median(), places=4)
+            self.assertAlmostEqual(col.limit(5).median(), Series(head).median(), places=4)
+
+        for col in self.text_cols:
+            self.assertRaisesRegex(
+                TypeError,
+                f'Cannot get median for Column of type {col.type}',
+                col.median
+            )
 
     def test_mode(self):
         for col in col_iterator(self.db):
@@ -146,35 +281,42 @@ class TestColumn(unittest.TestCase):
             self.assertGreater(len(out), 0)
 
             lst = list(out.values())
-            self.assertEqual(lst.count(lst[0]), len(lst))  # assert all values are the same
+            self.assertTrue(all(v == lst[0] for v in lst))  # assert all values are the same
 
             if col.type in (str, int):
-                ser_mode = col.to_series().mode().to_dict()
+                ser_mode = cached_series(col).mode().to_dict()
                 # convert to list because type(dict_values) is never equal to type(dict_keys)
                 self.assertEqual(list(ser_mode.values()), list(out.keys()))
 
     def test_describe(self):
         for col in col_iterator(self.db):
             col_dict: dict[str, float] = col.describe()
-            ser: Series = col.to_series()
+            stats = self.series_stats[col.table, col.name]
 
-            if col.data_is_numeric():
+            # the single-query aggregates should match the methods that run one query each
+            is_numeric = col.data_is_numeric()
+            expected = {'len': col.len, 'count': col.count(), 'min': col.min(), 'max': col.max()}
+            if is_numeric:
+                expected.update(sum=col.sum(), avg=col.avg())
+            self.assertEqual(col._describe_bulk(numeric=is_numeric), expected)
+
+            if is_numeric:
                 d = {
-                    col_dict['len']: len(ser),
-                    col_dict['count']: ser.count(),
-                    col_dict['min']: ser[ser.notnull()].min(),
-                    col_dict['max']: ser[ser.notnull()].max(),
-                    col_dict['sum']: ser.sum(),
-                    col_dict['avg']: ser.mean(),
-                    col_dict['median']: ser.median()
+                    col_dict['len']: stats['len'],
+                    col_dict['count']: stats['count'],
+                    col_dict['min']: stats['min'],
+                    col_dict['max']: stats['max'],
+                    col_dict['sum']: stats['sum'],
+                    col_dict['avg']: stats['mean'],
+                    col_dict['median']: stats['median']
                 }
             else:
                 d = {
-                    col_dict['len']: len(ser),
-                    col_dict['count']: ser.count(),
-                    col_dict['min']: ser[ser.notnull()].min(),
-                    col_dict['max']: ser[ser.notnull()].max(),
-                    col_dict['unique']: len(ser.unique())
+                    col_dict['len']: stats['len'],
+                    col_dict['count']: stats['count'],
+                    col_dict['min']: stats['min'],
+                    col_dict['max']: stats['max'],
+                    col_dict['unique']: len(stats['unique'])
                 }
 
             for key, val in d.items():
@@ -186,7 +328,7 @@ class TestColumn(unittest.TestCase):
     def test_unique(self):
         for col in col_iterator(self.db):
             col_unique = col.unique()
-            ser_unique = col.to_series().unique()
+            ser_unique = self.series_stats[col.table, col.name]['unique']
             self.assertEqual(len(col_unique), len(ser_unique))
 
             for x, y in zip(col_unique, ser_unique):
@@ -201,7 +343,7 @@ class TestColumn(unittest.TestCase):
     def test_value_counts(self):
         for col in col_iterator(self.db):
             col_vc = col.value_counts()
-            ser_vc = col.to_series().value_counts().to_dict()
+            ser_vc = self.series_stats[col.table, col.name]['value_counts']
 
             self.assertEqual(len(col_vc), len(ser_vc))
             self.assertEqual(col_vc, ser_vc)
@@ -229,15 +371,11 @@ class TestColumn(unittest.TestCase):
         self.assertEqual(len(data), 5)
 
     def test_sample(self):
-        out = self.column.sample()
+        out = self.column.sample(10)
         self.assertIsInstance(out, list)
+        self.assertEqual(len(out), 10)
         self.assertNotIsInstance(out[0], (list, tuple))
-
-        a = self.column.sample(10)
-        b = self.column.sample(10)
-        self.assertEqual(len(a), len(b))
-        self.assertEqual(len(a), 10)
-        self.assertNotEqual(a, b)
+        self.assertTrue(set(out).issubset(self.column_values))
 
     def test_apply(self):
         for col in col_iterator(self.db):
@@ -273,79 +411,68 @@ class TestColumn(unittest.TestCase):
                     if cell is not None:
                         self.assertNotIn(member=' ', container=cell)
 
-    def test_iloc(self):
+    def _assert_indexable(self, accessor: Callable[[int | slice | list], Any]) -> None:
         """
-        Test all three ways to get an index slice: int, list, and slice
-        """
-        self.assertGreaterEqual(len(self.table), 30,
-                                msg='First table must have at least 30 rows to complete this test')
+        Assert the given accessor returns the right values for an int, a list, and a slice
 
-        out = self.column.iloc[0]
-        self.assertNotIsInstance(out, (list, tuple))
+        The whole column is fetched once, and the output of each index is compared against it.
 
-        out = self.column.iloc[3]
-        self.assertNotIsInstance(out, (list, tuple))
-
-        out = self.column.iloc[-1]
+        :param accessor: Callable, for ex: `self.column.iloc.__getitem__` or `self.column.__getitem__`
+        :return: None
+        """
+        n = len(self.column)
+        all_data = accessor(slice(None))
+        self.assertIsInstance(all_data, list)
+        self.assertEqual(len(all_data), n)
+        self.assertFalse(any(isinstance(x, (list, tuple)) for x in all_data))
+
+        # run one query for each type of index, and compare the output against `all_data`
+        out = accessor(-1)
         self.assertNotIsInstance(out, (list, tuple))
-
-        last_row_idx = len(self.column) - 1
-        self.assertEqual(self.column.iloc[last_row_idx], self.column.iloc[-1])
-
-        lst = [3, 5, 3, -1]
-        out = self.column.iloc[lst]
-        self.assertIsInstance(out, list)
-        self.assertEqual(len(out), len(lst))
+        self.assertEqual(out, all_data[n - 1])
 
         lst = [3, -1, 5, 3, -1]
-        out = self.column.iloc[lst]
+        out = accessor(lst)
         self.assertIsInstance(out, list)
         self.assertEqual(len(out), len(lst))
+        self.assertEqual(out, [all_data[i] for i in lst])
 
-        out = self.column.iloc[:]
-        self.assertIsInstance(out, list)
-        self.assertEqual(len(out), len(self.column))
-
-        out = self.column.iloc[:5]
-        self.assertIsInstance(out, list)
-        self.assertEqual(len(out), 5)
-
-        out = self.column.iloc[3:]
-        self.assertIsInstance(out, list)
-        self.assertEqual(len(out), len(self.column) - 3)
-
-        out = self.column.iloc[3:8]
-        self.assertIsInstance(out, list)
-        self.assertEqual(len(out), 5)
-
-        out = self.column.iloc[2:24:2]
+        out = accessor(slice(2, 24, 2))
         self.assertIsInstance(out, list)
         self.assertEqual(len(out), 11)
+        self.assertEqual(out, all_data[2:24:2])
 
-        out = self.column.iloc[len(self.column) + 5:]
+        out = accessor(slice(n + 5, None))
         self.assertIsInstance(out, list)
         self.assertEqual(len(out), 0)
 
+    def test_iloc(self):
+        """
+        Test all three ways to get an index slice: int, list, and slice
+        """
+        self.assertGreaterEqual(len(self.table), 30,
+                                msg='First table must have at least 30 rows to complete this test')
+
+        n = len(self.column)
+        iloc = self.column.iloc
+        self._assert_indexable(iloc.__getitem__)
+
         types = [dict(), set(), tuple(), 3.32, '3.32']
         for i in types:
-            self.assertRaisesRegex(
-                TypeError,
-                f'Index must be of type: int, list, or slice. not: {type(i)}',
-                self.column.iloc.__getitem__, i
-            )
+            assert_bad_type(self, BAD_INDEX_PATTERN, iloc.__getitem__, i)
 
-        index = self.column.len
+        index = n
         self.assertRaisesRegex(
             IndexError,
             'Given index out of range',
-            self.column.iloc.__getitem__, index
+            iloc.__getitem__, index
         )
 
-        index = (self.column.len + 1) * -1  # to convert to negative
+        index = (n + 1) * -1  # to convert to negative
         self.assertRaisesRegex(
             IndexError,
             'Given index out of range',
-            self.column.iloc.__getitem__, index
+            iloc.__getitem__, index
         )
 
     def test_not_null(self):
@@ -361,7 +488,8 @@ class TestColumn(unittest.TestCase):
 
     def test_sort_values(self):
         for col in col_iterator(self.db):
-            py_sorted_col = sort_iterable_with_none_values(col)
+            ser = cached_series(col).sort_values(na_position='first')  # SQLite puts null values first
+            py_sorted_col = ser.astype(object).where(ser.notna(), None).tolist()
             sql_sorted_col = list(col.sort_values())
             self.assertEqual(len(py_sorted_col), len(sql_sorted_col))
             self.assertEqual(py_sorted_col, sql_sorted_col)
@@ -373,10 +501,11 @@ class TestColumn(unittest.TestCase):
                 self.assertEqual(len(out), i)
 
                 sliced_column: list = col.iloc[:i]
-                self.assertEqual(len(sliced_column), len(out))
-                self.assertEqual(sliced_column, list(out))
-
-                self.assertTrue(all(a == b for a, b in zip(out, sliced_column)))
+                out_list = list(out)  # iterate the view only once
+                self.assertEqual(len(out_list), i)
+                self.assertEqual(len(sliced_column), len(out_list))
+                self.assertTrue(np.array_equal(np.asarray(sliced_column, dtype=object),
+                                               np.asarray(out_list, dtype=object)))
 
     def test_filter(self):
         self.assertTrue(
@@ -388,7 +517,7 @@ class TestColumn(unittest.TestCase):
         filtered_col = df.country_name.filter(df.country_name == name)
 
         self.assertTrue(len(filtered_col) < len(df))
-        self.assertTrue(set(filtered_col).issubset(df.country_name))
+        self.assertTrue(set(filtered_col).issubset(self.country_names))
 
     def test_create_and_get_temp_view(self):
         name = f'test_view_{get_random_name(10)}'
@@ -416,19 +545,7 @@ class TestColumn(unittest.TestCase):
         There are two ways of getting a slice from a Column object;
         from the iloc property, ex: Column.iloc[-5], or: Column[-5]
         """
-        self.test_iloc()
-
-        out = self.column[-1]
-        self.assertNotIsInstance(out, (list, tuple))
-
-        lst = [3, -1, 5, 3, -1]
-        out = self.column[lst]
-        self.assertIsInstance(out, list)
-        self.assertEqual(len(out), len(lst))
-
-        out = self.column[2:24:2]
-        self.assertIsInstance(out, list)
-        self.assertEqual(len(out), 11)
+        self._assert_indexable(self.column.__getitem__)
 
         self.assertTrue(
             DB_FILE.endswith('forestation.db'),
@@ -439,19 +556,15 @@ class TestColumn(unittest.TestCase):
         filtered_col = df.country_name[df.country_name == name]
 
         self.assertTrue(len(filtered_col) < len(df))
-        self.assertTrue(set(filtered_col).issubset(df.country_name))
+        self.assertTrue(set(filtered_col).issubset(self.country_names))
 
         for item in ('abc', None, (1, 2, 3)):
-            self.assertRaisesRegex(
-                TypeError,
-                f'Argument must be of type Expression, int, slice, or list. not: {type(item)}',
-                self.column.__getitem__, item
-            )
+            assert_bad_type(self, BAD_ITEM_PATTERN, self.column.__getitem__, item)
 
     def test_iter(self):
         self.assertIsInstance(iter(self.column), Generator)
 
-        for val, _ in zip(self.column, range(5)):
+        for val in islice(self.column, 5):
             self.assertNotIsInstance(val, (tuple, list))
 
     def test_hash(self):
@@ -502,30 +615,40 @@ class TestColumnLogicalOp(unittest.TestCase):
     """
     Test logical operators for Column objects (db.table.col >= 20, db.table.col.between(10, 25))
     """
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.db = Database(DB_FILE, cache=True)
+        set_pragmas(cls.db)
+        cls.table: Table = cls.db[cls.db.tables[0]]
+        cls.column: Column = getattr(cls.table, cls.table.columns[0])
+        cls.numeric_cols, cls.text_cols = partition_columns(cls.db)
+
+        # compute the aggregates shared by the comparison tests only once, key: (table, column)
+        cls.medians = {(col.table, col.name): col.median() for col in cls.numeric_cols}
+        cls.modes = {(col.table, col.name): next(iter(col.mode())) for col in cls.numeric_cols + cls.text_cols}
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.db.exit()
+
     def setUp(self) -> None:
-        self.db = Database(DB_FILE, cache=True)
-        self.table: Table = self.db[self.db.tables[0]]
-        self.column: Column = getattr(self.table, self.table.columns[0])
+        self.temp_views = set(self.db.temp_views)
 
     def tearDown(self) -> None:
-        self.db.exit()
+        drop_temp_views(self.db, keep=self.temp_views)
 
     def test_add(self):
         df = self.db.forest_area
-        new_col = df.year + df.year
-        for a, b in zip(new_col, df.year):
+        year = list(df.year)
+        for a, b in zip(df.year + df.year, year, strict=True):
             self.assertEqual(a, b + b)
 
         col = self.db.forest_area.forest_area_sqkm
-        it = (2 for _ in range(len(col)))
-        new_col = col + it
-        for a, b in zip(new_col, col):
-            if a is not None:
-                self.assertEqual(a, b + 2)
-
-        for a, b in zip(col + 2.05, col):
-            if a is not None:
-                self.assertEqual(a, b + 2.05)
+        values = list(col)  # fetch the column once for the expected values (the operations below still query it)
+        base = not_null_array(values)
+        it = (2 for _ in range(len(values)))
+        np.testing.assert_array_equal(not_null_array(col + it), base + 2)
+        np.testing.assert_array_equal(not_null_array(col + 2.05), base + 2.05)
 
         col = self.db.land_area.country_name
         s = ' - Country name'
@@ -536,66 +659,51 @@ class TestColumnLogicalOp(unittest.TestCase):
                 self.assertTrue(x.endswith(s))
 
         col = self.db.land_area.total_area_sq_mi
-        for a, b in zip(col + True, col):
-            if a is not None:
-                self.assertEqual(a, b + True)
+        np.testing.assert_array_equal(not_null_array(col + True), not_null_array(col) + True)
 
     def test_sub(self):
         df = self.db.forest_area
-        new_col = df.year - df.year
-        for a, b in zip(new_col, df.year):
+        year = list(df.year)
+        for a, b in zip(df.year - df.year, year, strict=True):
             self.assertEqual(a, b - b)
 
         col = self.db.forest_area.forest_area_sqkm
-        it = (2 for _ in range(len(col)))
-        new_col = col - it
-        for a, b in zip(new_col, col):
-            if a is not None:
-                self.assertEqual(a, b - 2)
-
-        for a, b in zip(col - 2.05, col):
-            if a is not None:
-                self.assertEqual(a, b - 2.05)
+        values = list(col)
+        base = not_null_array(values)
+        it = (2 for _ in range(len(values)))
+        np.testing.assert_array_equal(not_null_array(col - it), base - 2)
+        np.testing.assert_array_equal(not_null_array(col - 2.05), base - 2.05)
 
     def test_mul(self):
         col = self.db.forest_area.forest_area_sqkm
+        values = list(col)
+        base = not_null_array(values)
 
-        it = (3 for _ in range(len(col)))
-        for a, b in zip(col, col * it):
-            if a is not None:
-                self.assertEqual(a * 3, b)
-
-        for a, b in zip(col, col * 1.25):
-            if a is not None:
-                self.assertEqual(a * 1.25, b)
+        it = (3 for _ in range(len(values)))
+        np.testing.assert_array_equal(not_null_array(col * it), base * 3)
+        np.testing.assert_array_equal(not_null_array(col * 1.25), base * 1.25)
 
     def test_truediv(self):
         col = self.db.forest_area.forest_area_sqkm
+        values = list(col)
+        base = not_null_array(values)
 
-        it = (21.3 for _ in range(len(col)))
-        for a, b in zip(col, col / it):
-            if a is not None:
-                self.assertEqual(a / 21.3, b)
-
-        for a, b in zip(col, col / 1.25):
-            if a is not None:
-                self.assertEqual(a / 1.25, b)
+        it = (21.3 for _ in range(len(values)))
+        np.testing.assert_array_equal(not_null_array(col / it), base / 21.3)
+        np.testing.assert_array_equal(not_null_array(col / 1.25), base / 1.25)
 
     def test_floordiv(self):
         col = self.db.forest_area.forest_area_sqkm
+        values = list(col)
+        base = not_null_array(values)
 
-        it = (3.3 for _ in range(len(col)))
-        for a, b in zip(col, col // it):
-            if a is not None:
-                self.assertEqual(a // 3.3, b)
-
-        for a, b in zip(col, col // 0.75):
-            if a is not None:
-                self.assertEqual(a // 0.75, b)
+        it = (3.3 for _ in range(len(values)))
+        np.testing.assert_array_equal(not_null_array(col // it), base // 3.3)
+        np.testing.assert_array_equal(not_null_array(col // 0.75), base // 0.75)
 
     def test_gt(self):
-        for col in col_iterator(self.db, numeric_only=True):
-            median = col.median()
+        for col in self.numeric_cols:
+            median = self.medians[col.table, col.name]
             exp = col > median
             filtered_col = col[exp]
             n_filtered_col = len(filtered_col)
@@ -603,11 +711,11 @@ class TestColumnLogicalOp(unittest.TestCase):
             self.assertIsInstance(exp, Expression)
             self.assertEqual(exp.query, f'{col.name} > {median}')
             self.assertLess(n_filtered_col, len(col))
-            self.assertTrue(all(val > median for val in filtered_col))
+            self.assertTrue((filtered_col.to_series() > median).all())
 
     def test_ge(self):
-        for col in col_iterator(self.db, numeric_only=True):
-            median = col.median()
+        for col in self.numeric_cols:
+            median = self.medians[col.table, col.name]
             exp = col >= median
             filtered_col = col[exp]
             n_filtered_col = len(filtered_col)
@@ -615,11 +723,11 @@ class TestColumnLogicalOp(unittest.TestCase):
             self.assertIsInstance(exp, Expression)
             self.assertEqual(exp.query, f'{col.name} >= {median}')
             self.assertLess(n_filtered_col, len(col))
-            self.assertTrue(all(val >= median for val in filtered_col))
+            self.assertTrue((filtered_col.to_series() >= median).all())
 
     def test_lt(self):
-        for col in col_iterator(self.db, numeric_only=True):
-            median = col.median()
+        for col in self.numeric_cols:
+            median = self.medians[col.table, col.name]
             exp = col < median
             filtered_col = col[exp]
             n_filtered_col = len(filtered_col)
@@ -627,11 +735,11 @@ class TestColumnLogicalOp(unittest.TestCase):
             self.assertIsInstance(exp, Expression)
             self.assertEqual(exp.query, f'{col.name} < {median}')
             self.assertLess(n_filtered_col, len(col))
-            self.assertTrue(all(val < median for val in filtered_col))
+            self.assertTrue((filtered_col.to_series() < median).all())
 
     def test_le(self):
-        for col in col_iterator(self.db, numeric_only=True):
-            median = col.median()
+        for col in self.numeric_cols:
+            median = self.medians[col.table, col.name]
             exp = col <= median
             filtered_col = col[exp]
             n_filtered_col = len(filtered_col)
@@ -639,11 +747,11 @@ class TestColumnLogicalOp(unittest.TestCase):
             self.assertIsInstance(exp, Expression)
             self.assertEqual(exp.query, f'{col.name} <= {median}')
             self.assertLess(n_filtered_col, len(col))
-            self.assertTrue(all(val <= median for val in filtered_col))
+            self.assertTrue((filtered_col.to_series() <= median).all())
 
     def test_eq(self):
-        for col in col_iterator(self.db, numeric_only=False):
-            mode = next(iter(col.mode().keys()))
+        for col in self.numeric_cols + self.text_cols:
+            mode = self.modes[col.table, col.name]
             exp = col == mode
             filt_col = col[exp]
 
@@ -656,8 +764,8 @@ class TestColumnLogicalOp(unittest.TestCase):
                 self.assertTrue(all(x == mode for x in filt_col))
 
     def test_ne(self):
-        for col in col_iterator(self.db, numeric_only=False):
-            mode = next(iter(col.mode().keys()))
+        for col in self.numeric_cols + self.text_cols:
+            mode = self.modes[col.table, col.name]
             exp = col != mode
             filt_col = col[exp]
 
@@ -677,10 +785,11 @@ class TestColumnLogicalOp(unittest.TestCase):
             self.assertTrue(all(x in options_set for x in filtered_col))
 
     def test_between(self):
-        for col in col_iterator(self.db, numeric_only=True):
+        for col in self.numeric_cols:
             a, b = sorted(col.not_null().sample(2))  # get two random numbers from the column
             filtered_col = col[col.between(a, b)]
-            self.assertTrue(all(a <= x <= b for x in filtered_col if x is not None))
+            ser = filtered_col.to_series()
+            self.assertTrue((((ser >= a) & (ser <= b)) | ser.isna()).all())
 
     def test_like(self):
         col: Column = self.db.regions.country_name
@@ -3,6 +3,7 @@ from pandas import DataFrame
 import unittest
 import sqlite3
 import shutil
+import tempfile
 from collections.abc import Generator
 from pathlib import Path
 
@@ -16,57 +17,87 @@ SQL_FILE = '../data/parch-and-posey.sql'
 SQLITE_FILE = '../data/mental_health.sqlite'
 MAIN_DATABASE = DB_FILE
 
+# expected tables for each database, in the same order as in sqlite_master
+SQL_FILE_TABLES = ('web_events', 'sales_reps', 'region', 'orders', 'accounts')
+DB_FILE_TABLES = ('forest_area', 'land_area', 'regions')
+SQLITE_FILE_TABLES = ('Answer', 'Question', 'Survey')
+
 MIN_TABLES = 1
 
+_SHARED_DBS: dict[str, Database] = {}
 
-class TestConnection(unittest.TestCase):
-    def setUp(self):
-        self.db = Database(MAIN_DATABASE, cache=True, populate_cache=True)
 
-        tables = self.db.tables
-        self.assertGreaterEqual(len(tables), MIN_TABLES,
-                                msg='Database must have at least one table for the tests')
+def shared_db(db_path: str) -> Database:
+    """
+    Get a Database for the given path, it's created on the first call and reused by the following ones
+
+    Only use it for tests that don't close the connection, the databases are closed in tearDownModule().
+
+    :param db_path: str, path to database
+    :return: Database
+    """
+    if db_path not in _SHARED_DBS:
+        _SHARED_DBS[db_path] = Database(db_path, cache=True)
+    return _SHARED_DBS[db_path]
+
 
-    def tearDown(self):
-        self.db.exit()
+def setUpModule():
+    tables = shared_db(MAIN_DATABASE).tables
+    assert len(tables) >= MIN_TABLES, 'Database must have at least one table for the tests'
+
+
+def tearDownModule():
+    for db in _SHARED_DBS.values():
+        db.exit()
+    _SHARED_DBS.clear()
+
+
+class TestConnection(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # shared by all the tests, the ones that need a fresh connection create their own instance
+        cls.db = shared_db(MAIN_DATABASE)  # the cache is populated lazily, see TestCache.test_is_ready()
 
     def test_init(self):
         valid_extension = ('.sql', '.db', '.sqlite', '.sqlite3')
+        err_msg = f'File extension must be one of the following: {", ".join(valid_extension)}'
 
-        self.assertRaisesRegex(
-            FileTypeError,
-            f'File extension must be one of the following: {", ".join(valid_extension)}',
-            Database, db_path='my_db.txt'
-        )
-        self.assertRaisesRegex(
-            FileTypeError,
-            f'File extension must be one of the following: {", ".join(valid_extension)}',
-            Database, db_path='my_db.csv'
-        )
+        self.assertRaisesRegex(FileTypeError, err_msg, Database, db_path='my_db.txt')
+        self.assertRaisesRegex(FileTypeError, err_msg, Database, db_path='my_db.csv')
 
         # test file type sql:
         folder = Path(__file__).parent.parent / 'pandasdb-local-databases'  # folder to save converted databases
         if folder.exists():
             shutil.rmtree(folder)
 
-        db = Database(SQL_FILE)
-        self.assertListEqual(db.tables, ['web_events', 'sales_reps', 'region', 'orders', 'accounts'])
-        db.exit()
-
-        # run same test again after creating/caching .db file
-        db = Database(SQL_FILE)
-        self.assertListEqual(db.tables, ['web_events', 'sales_reps', 'region', 'orders', 'accounts'])
-        db.exit()
+        # the second pass runs after the .db file was created/cached by the first one
+        for attempt in range(2):
+            with self.subTest(attempt=attempt):
+                db = Database(SQL_FILE)
+                self.assertEqual(tuple(db.tables), SQL_FILE_TABLES)
+                db.exit()
 
         # test file type db:
-        db = Database(DB_FILE)
-        self.assertListEqual(db.tables, ['forest_area', 'land_area', 'regions'])
-        db.exit()
+        self.assertEqual(tuple(shared_db(DB_FILE).tables), DB_FILE_TABLES)
 
         # test file type sqlite:
-        db = Database(SQLITE_FILE)
-        self.assertListEqual(db.tables, ['Answer', 'Question', 'Survey'])
-        db.exit()
+        self.assertEqual(tuple(shared_db(SQLITE_FILE).tables), SQLITE_FILE_TABLES)
+
+    def test_read_only(self):
+        for kwargs in ({'read_only': True}, {'immutable': True}):
+            with self.subTest(**kwargs), Database(MAIN_DATABASE, cache=False, **kwargs) as db:
+                self.assertEqual(tuple(db.tables), DB_FILE_TABLES)
+                self.assertGreater(len(db.forest_area), 0)
+
+                self.assertRaisesRegex(
+                    sqlite3.OperationalError,
+                    'attempt to write a readonly database',
+                    db.conn.execute, 'CREATE TABLE test_table (a INTEGER)'
+                )
+
+                # temporary views live outside of the database file, so they can still be created
+                create_temp_view(conn=db.conn, view_name='test_view', query='SELECT * FROM regions')
+                self.assertIn(member='test_view', container=db.temp_views)
 
     def test_conn_open(self):
         db = Database(MAIN_DATABASE)
@@ -85,7 +116,7 @@ class TestConnection(unittest.TestCase):
         self.assertIsInstance(next(iter(out)), str)
         self.assertGreaterEqual(len(out), MIN_TABLES)
 
-        tables = set(self.db.tables)
+        tables = set(out)
         views = set(self.db.views)
         shared_items = tables & views
         self.assertEqual(len(shared_items), 0)
@@ -95,7 +126,7 @@ class TestConnection(unittest.TestCase):
         self.assertIsInstance(out, list)
 
         tables = set(self.db.tables)
-        views = set(self.db.views)
+        views = set(out)
         shared_items = tables & views
         self.assertEqual(len(shared_items), 0)
 
@@ -104,21 +135,6 @@ class TestConnection(unittest.TestCase):
         self.assertIsInstance(out, list)
         self.assertEqual(len(out), 0)  # should be empty right after creating the SQL connection
 
-    def test_temp_views(self):
-        db = Database(MAIN_DATABASE, cache=False)
-        out = db.temp_views
-        self.assertIsInstance(out, list)
-        self.assertEqual(len(out), 0)  # should be empty right after creating the SQL connection
-
-        name = 'test_view_1'
-        query = f'SELECT * FROM {db.tables[0]} LIMIT 50'
-        create_temp_view(conn=db.conn, view_name=name, query=query, drop_if_exists=False)
-        self.assertIn(member=name, container=db.temp_views)
-
-        with db.conn as cur:
-            cur.execute(f'DROP VIEW {name}')
-        self.assertNotIn(member=name, container=db.temp_views)
-
     def test_get_columns(self):
         for table in self.db.tables:
             out = self.db.get_columns(table)
@@ -150,16 +166,34 @@ class TestConnection(unittest.TestCase):
         ON regions.country_code = forest_area.country_code
         AND regions.country_name = forest_area.country_name"""
 
-        df = self.db.query(sql_query=query)
+        # the column names are checked without fetching the rows, see test_query_columns()
+        df = self.db.query(sql_query=query + ' LIMIT 5')
         self.assertIsInstance(df, DataFrame)
+        self.assertEqual(len(df), 5)
+        self.assertEqual(df.columns.to_list(), self.db.query_columns(sql_query=query))
+
+    def test_query_columns(self):
+        self.assertEqual(MAIN_DATABASE, '../data/forestation.db',
+                         msg="This test works only on this specific Database (forestation.db)")
+        query = """
+        SELECT * FROM forest_area
+        JOIN regions
+        ON regions.country_code = forest_area.country_code
+        AND regions.country_name = forest_area.country_name"""
+
+        out = self.db.query_columns(sql_query=query)
+        self.assertIsInstance(out, list)
 
         table_cols = self.db.forest_area.columns + self.db.regions.columns
-        self.assertEqual(len(df.columns), len(table_cols))
-        self.assertFalse(df.columns.has_duplicates)
-        self.assertTrue(all(x in df.columns for x in table_cols))
+        self.assertEqual(len(out), len(table_cols))
+        self.assertEqual(len(set(out)), len(out))
+        self.assertTrue(set(table_cols) <= set(out))
         renamed_cols = ['country_code', 'country_name', 'year', 'forest_area_sqkm',
                         'country_name_2', 'country_code_2', 'region', 'income_group']
-        self.assertEqual(df.columns.to_list(), renamed_cols)
+        self.assertEqual(out, renamed_cols)
+
+        out = self.db.query_columns(sql_query=query, rename_duplicates=False)
+        self.assertEqual(out, table_cols)
 
     def test_context_manager(self):
         with Database(MAIN_DATABASE) as data_base:
@@ -190,15 +224,15 @@ class TestConnection(unittest.TestCase):
 
     def test_set_table(self):
         tables = self.db.tables
-        for table in tables:
-            self.assertIn(member=table, container=self.db._table_items)
-            self.assertIsInstance(self.db._table_items[table], Table)
+        self.assertLessEqual(set(tables), self.db._table_items.keys())
+        self.assertTrue(all(isinstance(self.db._table_items[table], Table) for table in tables))
 
         self.assertTrue(hasattr(self.db, 'conn'))
         self.assertIsInstance(self.db.conn, sqlite3.Connection)
         self.assertNotIn(member='conn', container=self.db._table_items)
 
         self.db._set_table(table='conn')
+        self.addCleanup(self.db._table_items.pop, 'conn')  # don't leak the table into the other tests
         self.assertIn(member='conn', container=self.db._table_items)
         self.assertIsInstance(self.db.conn, sqlite3.Connection)  # make sure we don't overwrite pre-existing attributes
 
@@ -218,29 +252,17 @@ class TestConnection(unittest.TestCase):
 
         If a requested table isn't present in the Database, KeyError is raised
         """
-        for table in self.db.tables:
+        tables = self.db.tables
+        tables_csv = ", ".join(tables)
+        for table in tables:
             non_existent_table = f'{table} {0.32}'
             self.assertRaisesRegex(
                 KeyError,
-                f'No such Table: {non_existent_table}, must be one of the following: {", ".join(self.db.tables)}',
+                f'No such Table: {non_existent_table}, must be one of the following: {tables_csv}',
                 self.db.__getitem__, non_existent_table
             )
 
-        # test table that was created after Database.__init__()
-        table_name = 'test_table'
-        with self.db.conn as cur:
-            cur.execute(f'CREATE TABLE {table_name} AS SELECT * FROM regions LIMIT 10')
-
-        out = self.db[table_name]
-        self.assertIsInstance(out, Table)
-        self.assertIn(table_name, container=self.db._table_items)
-        self.assertTrue(hasattr(self.db, table_name))
-
-        # drop table after test
-        with self.db.conn as cur:
-            cur.execute(f'DROP TABLE {table_name}')
-
-        for table in self.db.tables:
+        for table in tables:
             table_item = self.db[table]
             table_attr = getattr(self.db, table)
 
@@ -259,6 +281,61 @@ class TestConnection(unittest.TestCase):
         self.assertEqual(out, len(self.db.tables))
 
     def test_repr(self):
-        self.assertIsInstance(repr(self.db), str)
-        self.assertIsInstance(str(self.db), str)
-        self.assertEqual(repr(self.db), str(self.db))
+        r, s = repr(self.db), str(self.db)
+        self.assertIsInstance(r, str)
+        self.assertIsInstance(s, str)
+        self.assertEqual(r, s)
+
+
+class TestConnectionWrites(unittest.TestCase):
+    """
+    Tests that write to the database, they run on a private copy of it so that
+    other tests (possibly running in parallel) never see the changes
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        db_copy = shutil.copy(MAIN_DATABASE, cls.tmp_dir)
+        cls.db = Database(db_copy, cache=False)
+
+        # the copy is thrown away at the end, so skip the rollback journal and the fsync calls on commit
+        cls.db.conn.execute('PRAGMA journal_mode=MEMORY')
+        cls.db.conn.execute('PRAGMA synchronous=OFF')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.exit()
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_getitem_new_table(self):
+        """
+        If a table is added to the Database after initializing the instance, it will be created
+        and stored in the instance only once the user tries to get it
+        """
+        table_name = 'test_table'
+        with self.db.conn as cur:
+            cur.execute(f'CREATE TABLE {table_name} AS SELECT * FROM regions LIMIT 10')
+        self.assertNotIn(table_name, container=self.db._table_items)
+
+        out = self.db[table_name]
+        self.assertIsInstance(out, Table)
+        self.assertIn(table_name, container=self.db._table_items)
+        self.assertTrue(hasattr(self.db, table_name))
+
+        with self.db.conn as cur:
+            cur.execute(f'DROP TABLE {table_name}')
+
+    def test_temp_views(self):
+        db = self.db
+        out = db.temp_views
+        self.assertIsInstance(out, list)
+        self.assertEqual(len(out), 0)  # should be empty right after creating the SQL connection
+
+        name = 'test_view_1'
+        query = f'SELECT * FROM {db.tables[0]} LIMIT 50'
+        create_temp_view(conn=db.conn, view_name=name, query=query, drop_if_exists=False)
+        self.assertIn(member=name, container=db.temp_views)
+
+        with db.conn as cur:
+            cur.execute(f'DROP VIEW {name}')
+        self.assertNotIn(member=name, container=db.temp_views)
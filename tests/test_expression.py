@@ -1,10 +1,20 @@
 import unittest
+import operator
 
 from pandasdb.expression import Expression
 from pandasdb.exceptions import ExpressionError
 
+JOIN = {'AND': ' AND ', 'OR': ' OR '}  # separator between the queries of two joined expressions
+
 
 class TestExpression(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # `&` and `|` return new instances, so the same expressions can be reused by all the tests
+        cls.a = Expression(query='name == "jake"', table='accounts')
+        cls.b = Expression(query='age >= 24', table='accounts')
+        cls.c = Expression(query='city_code IN ("LA", "NY", "LV")', table='accounts')
+
     def test_init(self):
         self.assertRaises(
             TypeError,
@@ -28,34 +38,28 @@ class TestExpression(unittest.TestCase):
             lambda: a & b
         )
 
-    def test_and(self):
-        a = Expression(query='name == "jake"', table='accounts')
-        b = Expression(query='age >= 24', table='accounts')
-
-        a_and_b = a & b
-        self.assertEqual(a_and_b.query, 'name == "jake" AND age >= 24')
-
-        c = Expression(query='city_code IN ("LA", "NY", "LV")', table='accounts')
-        abc = a_and_b & c
-        query = 'name == "jake" AND age >= 24 AND city_code IN ("LA", "NY", "LV")'
-        self.assertEqual(abc.query, query)
-
-    def test_or(self):
-        a = Expression(query='name == "jake"', table='accounts')
-        b = Expression(query='age >= 24', table='accounts')
+    def test_and_or(self):
+        """
+        Test `&` and `|`, both go through the same code path and only differ by the separator
+        """
+        a, b, c = self.a, self.b, self.c
+        a_query, b_query = a.query, b.query
 
-        a_or_b = a | b
-        self.assertEqual(a_or_b.query, 'name == "jake" OR age >= 24')
+        for op, sep in ((operator.and_, 'AND'), (operator.or_, 'OR')):
+            with self.subTest(op=sep):
+                a_b = op(a, b)
+                self.assertIsInstance(a_b, Expression)
+                self.assertEqual(a_b.query, JOIN[sep].join([a.query, b.query]))
+                # the operands are shared between the tests, make sure they weren't modified
+                self.assertIs(a.query, a_query)
+                self.assertIs(b.query, b_query)
 
-        c = Expression(query='city_code IN ("LA", "NY", "LV")', table='accounts')
-        three_expressions = a_or_b | c
-        query = 'name == "jake" OR age >= 24 OR city_code IN ("LA", "NY", "LV")'
-        self.assertEqual(three_expressions.query, query)
+                abc = op(a_b, c)
+                self.assertEqual(abc.query, f'name == "jake" {sep} age >= 24 {sep} city_code IN ("LA", "NY", "LV")')
+                self.assertEqual(abc.query, JOIN[sep].join([a.query, b.query, c.query]))
 
     def test_str(self):
-        a = Expression(query='name == "jake"', table='accounts')
-        self.assertIn(member=a.query, container=str(a))
+        self.assertIn(member=self.a.query, container=str(self.a))
 
     def test_repr(self):
-        a = Expression(query='name == "jake"', table='accounts')
-        eval(repr(a))
+        eval(repr(self.a))
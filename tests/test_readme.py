@@ -26,10 +26,8 @@ class TestReadme(unittest.TestCase):
                 if 'db_path' in line:
                     replace_path = line.replace('data/', '../data/')
                     code.append(replace_path)
-                    print(f'{line=}, \n{replace_path=}')
                 else:
                     code.append(line)
 
         code = ''.join(code)
-        print(code)
         exec(code)
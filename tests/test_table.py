@@ -1,8 +1,15 @@
-from pandas import DataFrame
+from pandas import DataFrame, read_sql
+from pandas.testing import assert_frame_equal
+import numpy as np
 
 import unittest
+import os
 import random
+import re
+import time
 from collections.abc import Generator
+from contextlib import closing
+from itertools import islice
 
 from pandasdb import Database
 from pandasdb.table import IndexLoc, Table, TableView
@@ -10,6 +17,8 @@ from pandasdb.column import Column
 from pandasdb.exceptions import InvalidColumnError
 from pandasdb.utils import get_random_name
 
+from tests.helpers import BAD_INDEX_PATTERN, assert_bad_type, drop_temp_views
+
 
 DB_FILE = '../data/forestation.db'
 SQL_FILE = '../data/parch-and-posey.sql'
@@ -19,25 +28,92 @@ MAIN_DATABASE = DB_FILE
 MIN_TABLES = 1
 MIN_COLUMNS = 3  # for the first table
 
+QUERY_TIMEOUT = 30  # seconds, for all the queries of a single test
+SLOW_TESTS = os.environ.get('SLOW_TESTS') == '1'  # run the exhaustive version of the expensive checks
 
-class TestTable(unittest.TestCase):
-    def setUp(self) -> None:
-        self.db = Database(MAIN_DATABASE)
-        self.table: Table = self.db[self.db.tables[0]]
+is_int = np.frompyfunc(lambda x: isinstance(x, int), 1, 1)  # element-wise isinstance() for object arrays
+
+
+def setUpModule():
+    with Database(MAIN_DATABASE, cache=False) as db:
+        tables = db.tables
+        assert len(tables) >= MIN_TABLES, 'Database must have at least one table for the tests'
+        assert len(db[tables[0]].columns) >= MIN_COLUMNS, \
+            'Database must have at least 3 columns in the first table for the tests'
+
+
+def tables_to_test(db: Database) -> list[Table]:
+    """
+    Get the tables for the tests that loop over the whole database
+
+    All the tables if SLOW_TESTS is set, otherwise only the first one.
+
+    :param db: Database
+    :return: list with Table objects
+    """
+    tables = [table for _, table in db.items()]
+    return tables if SLOW_TESTS else tables[:1]
 
-        tables = self.db.tables
-        self.assertGreaterEqual(len(tables), MIN_TABLES,
-                                msg='Database must have at least one table for the tests')
 
-        self.assertGreaterEqual(len(self.table.columns), MIN_COLUMNS,
-                                msg='Database must have at least 3 columns in the first table for the tests')
+def set_query_timeout(db: Database, seconds: float) -> None:
+    """
+    Abort any query that runs on the connection after the given amount of seconds from now
+
+    The aborted query raises sqlite3.OperationalError ('interrupted'), so a runaway query
+    fails the test instead of hanging it.
+
+    :param db: Database
+    :param seconds: float
+    :return: None
+    """
+    deadline = time.monotonic() + seconds
+    db.conn.set_progress_handler(lambda: time.monotonic() > deadline, 10_000)
+
+
+class TableTestCase(unittest.TestCase):
+    """
+    Shared fixture for the test classes in this module: one Database per class, and per-test cleanup
+
+    The tests never write to the database file (it's opened as immutable), the only objects they create
+    are temporary views which only exist on the connection of the class (and are dropped in tearDown()).
+    So the classes in this module can be split across parallel worker processes (e.g. `pytest -n auto`).
+    """
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.db = Database(MAIN_DATABASE, cache=False, immutable=True)
+        cls.table: Table = cls.db[cls.db.tables[0]]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.db.exit()
+
+    def setUp(self) -> None:
+        self.temp_views = set(self.db.temp_views)
+        set_query_timeout(self.db, QUERY_TIMEOUT)
 
     def tearDown(self) -> None:
-        self.db.exit()
+        self.db.conn.set_progress_handler(None, 0)
+        drop_temp_views(self.db, keep=self.temp_views)
+
+
+class TestTable(TableTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+
+        # the expected data for the first table, fetched directly from SQLite once for the whole class
+        with cls.table.conn as cursor:
+            cls.all_rows: list[tuple] = cursor.execute(cls.table.query).fetchall()
+        cls.all_df = DataFrame(cls.all_rows, columns=cls.table.columns)
+
+        # the error raised for a column that isn't in the first table
+        cls.invalid_col_pattern = re.compile(
+            f'^Column must be one of the following: {re.escape(", ".join(cls.table.columns))}$')
 
     def test_init(self):
-        for col in self.table.columns:
-            self.assertTrue(expr=hasattr(self.table, col),
+        table = self.table
+        for col in table.columns:
+            self.assertTrue(expr=hasattr(table, col),
                             msg=f'Columns: {col} not in Table attributes')
 
     def test_query(self):
@@ -61,68 +137,79 @@ class TestTable(unittest.TestCase):
         self.assertNotIn(member='rowid', container=out)
 
     def test_columns(self):
-        self.assertTrue(len(self.table.columns) >= 3)
-        for col_name in self.table.columns:
-            self.assertIsInstance(col_name, str)
+        cols = self.table.columns
+        self.assertGreaterEqual(len(cols), MIN_COLUMNS)
+        self.assertTrue(all(isinstance(col_name, str) for col_name in cols), msg=f'Not all columns are str: {cols}')
 
     def test_len(self):
         with self.table.conn as cursor:
-            rows = len(cursor.execute(self.table.query).fetchall())
+            rows = cursor.execute(f'SELECT COUNT(*) FROM ({self.table.query})').fetchone()[0]
 
-        self.assertIsInstance(self.table.len, int)
+        length = self.table.len  # the fixture doesn't cache queries, so each access runs COUNT(*)
+        self.assertIsInstance(length, int)
         self.assertNotEqual(rows, 0)
-        self.assertEqual(self.table.len, rows)
-        self.assertEqual(self.table.len, len(self.table))
+        self.assertEqual(length, rows)
+        self.assertEqual(len(self.table), length)
 
     def test_shape(self):
-        with self.table.conn as cursor:
-            first_row = next(cursor.execute(self.table.query))
+        with closing(self.table.conn.cursor()) as cursor:
+            n_rows = cursor.execute(f'SELECT COUNT(*) FROM ({self.table.query})').fetchone()[0]
+            first_row = cursor.execute(f'{self.table.query} LIMIT 1').fetchmany(1)[0]
 
-        shape = self.table.len, len(first_row)
-        self.assertEqual(self.table.shape, shape)
-        self.assertEqual(self.table.shape, self.table.to_df().shape)
+        shape = self.table.shape
+        self.assertEqual(shape, (n_rows, len(first_row)))
+        self.assertEqual(shape, self.all_df.shape)
 
     def test_describe(self):
-        for _, table in self.db.items():
-            data = {}
-            for name, col in table.items():
-                data[name] = col.describe()
+        for table in tables_to_test(self.db):
+            result = table.describe()
+            columns = table.columns
+            self.assertIsInstance(result, dict)
+            self.assertEqual(list(result), columns)
 
-            self.assertIsInstance(data, dict)
-            self.assertEqual(len(data), len(table.columns))
-            self.assertEqual(table.describe(), data)
+            # Table.describe() runs the same queries as Column.describe(), so compare just one column
+            # unless the slow tests are enabled
+            for name in (columns if SLOW_TESTS else columns[:1]):
+                self.assertEqual(result[name], table[name].describe())
 
     def test_to_df(self):
-        df = self.table.to_df()
+        table = self.table
+        df = table.to_df()
         self.assertIsInstance(df, DataFrame)
-        self.assertEqual(df.shape, self.table.shape)
-        self.assertEqual(list(df.columns), self.table.columns)
+        self.assertEqual(df.shape, table.shape)
+        self.assertEqual(list(df.columns), table.columns)
 
-        with self.table.conn as cursor:
-            db_first_row = cursor.execute(self.table.query).fetchone()
+        # compare plain python values, the expected row was already fetched in setUpClass()
+        self.assertEqual(df.iloc[0].to_numpy(copy=False).tolist(), list(self.all_rows[0]))
 
-        df_first_row = tuple(df.iloc[0])
-        self.assertEqual(df_first_row, db_first_row)
+        # the first chunk streamed by pandas itself should match the same rows of the DataFrame
+        expected = next(read_sql(table.query, table.conn, chunksize=4096))
+        assert_frame_equal(df.head(4096), expected)
 
     def test_data(self):
-        data = self.table.data()
-        first_row = data[0]
-
+        probe = self.table.data(5)
+        self.assertIsInstance(probe, list)
+        self.assertEqual(len(probe), 5)
+        self.assertEqual(len(probe[0]), len(self.table.columns))
+        self.assertEqual(probe, self.all_rows[:5])
+
+        # test the path without a limit on a small view, instead of fetching the whole table
+        data = self.table.limit(20).data()
         self.assertIsInstance(data, list)
-        self.assertEqual(len(data), self.table.len)
-        self.assertEqual(len(first_row), len(self.table.columns))
+        self.assertEqual(data, self.all_rows[:20])
 
-        data = self.table.data(5)
-        self.assertEqual(len(data), 5)
+        with self.table.conn as cursor:
+            n_rows = cursor.execute(f'SELECT COUNT(*) FROM ({self.table.query})').fetchone()[0]
+        self.assertEqual(self.table.len, n_rows)
 
     def test_sample(self):
         out = self.table.sample(n=10)
         self.assertIsInstance(out, list)
         self.assertEqual(len(out), 10)
 
-        random_samples = [self.table.sample() for _ in range(5)]
-        unique_items = (random_samples.count(x) == 1 for x in random_samples)
-        self.assertTrue(all(unique_items))
+        # each sample is a list of rows, convert it to a tuple so it can be hashed
+        random_samples = [tuple(self.table.sample()) for _ in range(5)]
+        self.assertEqual(len(set(random_samples)), len(random_samples), msg='sample() returned duplicates')
 
     def test_items(self):
         self.assertIsInstance(self.table.items(), Generator)
@@ -139,113 +226,102 @@ class TestTable(unittest.TestCase):
             self.assertEqual(len(data), 5)
 
     def test_applymap(self):
-        for table_name in self.db.tables:
-            table = self.db[table_name].applymap(
+        for tbl in tables_to_test(self.db):
+            table = tbl.applymap(
                 lambda x: len(str(x)) if x is None or type(x) in (str, float) else x,
                 ignore_na=False
             )
 
-            for row in table:
-                self.assertIsInstance(row, tuple)
+            rows = list(table)
+            self.assertTrue(all(isinstance(row, tuple) for row in rows))
 
-                for item in row:
-                    self.assertIsInstance(item, int)
+            arr = np.array(rows, dtype=object)
+            self.assertTrue(is_int(arr).all())
 
     def test_iloc(self):
         """
         Test all three ways to get an index slice: int, list, and slice
         """
-        self.assertGreaterEqual(len(self.table), 30,
-                                msg='First table must have at least 30 rows to complete this test')
-
-        out = self.table.iloc
-        self.assertIsInstance(out, IndexLoc)
+        table = self.table
+        n = len(table)
+        ncols = len(table.columns)
+        self.assertGreaterEqual(n, 30, msg='First table must have at least 30 rows to complete this test')
 
-        out = self.table.iloc[0]
-        self.assertIsInstance(out, tuple)
-        self.assertEqual(len(out), len(self.table.columns))
+        iloc = table.iloc  # IndexLoc counts the rows on init, so create it only once
+        self.assertIsInstance(iloc, IndexLoc)
 
-        out = self.table.iloc[3]
-        self.assertIsInstance(out, tuple)
-        self.assertEqual(len(out), len(self.table.columns))
+        # fetch the valid int indexes in one query, and only go through the int path once
+        last_row_idx = n - 1
+        rows = iloc[[0, 3, -1, last_row_idx]]
+        for row in rows:
+            self.assertIsInstance(row, tuple)
+            self.assertEqual(len(row), ncols)
+        self.assertEqual(rows[2], rows[3])
+        self.assertEqual(rows, [self.all_rows[0], self.all_rows[3], self.all_rows[-1], self.all_rows[-1]])
 
-        out = self.table.iloc[-1]
+        out = iloc[-1]
         self.assertIsInstance(out, tuple)
-        self.assertEqual(len(out), len(self.table.columns))
+        self.assertEqual(out, rows[2])
 
-        last_row_idx = len(self.table) - 1
-        self.assertEqual(self.table.iloc[last_row_idx], self.table.iloc[-1])
+        # fetch the whole table once, and compare the output of the other indexes against it
+        all_rows = iloc[:]
+        self.assertIsInstance(all_rows, list)
+        self.assertEqual(len(all_rows), n)
+        self.assertEqual(all_rows, self.all_rows)
 
-        lst = [3, 5, 3, -1]
-        out = self.table.iloc[lst]
+        # run both index lists (unordered, with duplicates) as a single query, and split the output locally
+        lists = ([3, 5, 3, -1], [3, -1, 5, 3, -1])
+        out = iloc[[idx for lst in lists for idx in lst]]
         self.assertIsInstance(out, list)
-        self.assertEqual(len(out), len(lst))
-
-        lst = [3, -1, 5, 3, -1]
-        out = self.table.iloc[lst]
-        self.assertIsInstance(out, list)
-        self.assertEqual(len(out), len(lst))
-
-        out = self.table.iloc[:]
-        self.assertIsInstance(out, list)
-        self.assertEqual(len(out), len(self.table))
-
-        out = self.table.iloc[:5]
-        self.assertIsInstance(out, list)
-        self.assertEqual(len(out), 5)
-
-        out = self.table.iloc[3:]
-        self.assertIsInstance(out, list)
-        self.assertEqual(len(out), len(self.table) - 3)
-
-        out = self.table.iloc[3:8]
-        self.assertIsInstance(out, list)
-        self.assertEqual(len(out), 5)
-
-        out = self.table.iloc[2:24:2]
-        self.assertIsInstance(out, list)
-        self.assertEqual(len(out), 11)
-
-        out = self.table.iloc[len(self.table) + 5:]
-        self.assertIsInstance(out, list)
-        self.assertEqual(len(out), 0)
+        start = 0
+        for lst in lists:
+            self.assertEqual(out[start:start + len(lst)], [all_rows[idx] for idx in lst])
+            start += len(lst)
+
+        # (slice, expected length), `n - 3:` covers the open-ended slice without fetching the whole table again
+        cases = (
+            (slice(None, 5), 5),
+            (slice(n - 3, None), 3),
+            (slice(3, 8), 5),
+            (slice(2, 24, 2), 11),
+            (slice(n + 5, None), 0),
+        )
+        for sl, length in cases:
+            with self.subTest(sl=sl):
+                out = iloc[sl]
+                self.assertIsInstance(out, list)
+                self.assertEqual(len(out), length)
+                self.assertEqual(out, all_rows[sl])
 
         types = [dict(), set(), tuple(), 3.32, '3.32']
         for i in types:
-            self.assertRaisesRegex(
-                TypeError,
-                f'Index must be of type: int, list, or slice. not: {type(i)}',
-                self.table.iloc.__getitem__, i
-            )
+            assert_bad_type(self, BAD_INDEX_PATTERN, iloc.__getitem__, i)
 
-        index = self.table.len
-        self.assertRaisesRegex(
-            IndexError,
-            'Given index out of range',
-            self.table.iloc.__getitem__, index
-        )
+        index = n
+        with self.assertRaises(IndexError) as cm:
+            iloc[index]
+        self.assertIn('Given index out of range', str(cm.exception))
 
-        index = (self.table.len + 1) * -1  # to convert to negative
-        self.assertRaisesRegex(
-            IndexError,
-            'Given index out of range',
-            self.table.iloc.__getitem__, index
-        )
+        index = (n + 1) * -1  # to convert to negative
+        with self.assertRaises(IndexError) as cm:
+            iloc[index]
+        self.assertIn('Given index out of range', str(cm.exception))
 
     def test_filter(self):
         tbl = self.db.regions
+        tbl_cols = tbl.columns  # runs a PRAGMA query on each access
         out = tbl.filter(tbl.income_group == 'Low income')
 
         self.assertEqual(len(self.db.temp_views), 1)
-        self.assertEqual(out.shape[1], tbl.shape[1])
-        self.assertEqual(out.columns, tbl.columns)
+        self.assertEqual(out.shape[1], len(tbl_cols))
+        self.assertEqual(out.columns, tbl_cols)
         self.assertTrue(len(out) < len(tbl))
         self.assertEqual(len(out), 34)
 
         # filter the filtered table
         out2 = out.filter(out.region == 'Sub-Saharan Africa')
-        self.assertEqual(out2.shape[1], tbl.shape[1])
-        self.assertEqual(out2.columns, tbl.columns)
+        self.assertEqual(out2.shape[1], len(tbl_cols))
+        self.assertEqual(out2.columns, tbl_cols)
         self.assertTrue(len(out2) < len(out))
         self.assertEqual(len(out2), 27)
 
@@ -263,11 +339,12 @@ class TestTable(unittest.TestCase):
 
     def test_sort_values(self):
         tbl: Table = self.db.forest_area
+        tbl_shape, tbl_cols = tbl.shape, tbl.columns
         out = tbl.sort_values(column='year', ascending=True)
         self.assertIsInstance(out, Table)
         self.assertIsInstance(out, TableView)
-        self.assertEqual(tbl.shape, out.shape)
-        self.assertEqual(tbl.columns, out.columns)
+        self.assertEqual(tbl_shape, out.shape)
+        self.assertEqual(tbl_cols, out.columns)
 
         query = f'SELECT year FROM {out.name} WHERE year IS NOT NULL'
         with out.conn as cur:
@@ -278,8 +355,8 @@ class TestTable(unittest.TestCase):
         tbl.sort_values(column=['country_code', 'country_name', 'year'])
         tbl.sort_values(column={'country_code': 'ASC', 'country_name': 'DESC', 'year': 'ASC'})
         out = tbl.sort_values(column={'forest_area_sqkm': 'DESC', 'country_code': 'ASC', 'year': 'ASC'})
-        self.assertEqual(tbl.shape, out.shape)
-        self.assertEqual(tbl.columns, out.columns)
+        self.assertEqual(tbl_shape, out.shape)
+        self.assertEqual(tbl_cols, out.columns)
 
         types = [set(), tuple(), 3.32]
         for t in types:
@@ -331,9 +408,17 @@ class TestTable(unittest.TestCase):
     def test_iter(self):
         self.assertIsInstance(iter(self.table), Generator)
 
-        for row, _ in zip(self.table, range(5)):
+        # fetch the expected rows in a single batch
+        with closing(self.table.conn.cursor()) as cursor:
+            expected_rows = cursor.execute(self.table.query).fetchmany(5)
+
+        ncols = len(self.table.columns)
+        rows = []
+        for row in islice(self.table, 5):
             self.assertIsInstance(row, tuple)
-            self.assertEqual(len(row), len(self.table.columns))
+            self.assertEqual(len(row), ncols)
+            rows.append(row)
+        self.assertEqual(rows, expected_rows)
 
     def test_get_col(self):
         """
@@ -348,19 +433,19 @@ class TestTable(unittest.TestCase):
         non_existing_column = get_random_name(10)
         self.assertRaisesRegex(
             InvalidColumnError,
-            f'^Column must be one of the following: {", ".join(self.table.columns)}$',
+            self.invalid_col_pattern,
             self.table._get_col, non_existing_column
         )
 
-        for col in self.table.columns:
-            col_obj = self.table._get_col(column=col)
-            self.assertEqual(col_obj.name, col)
-
-            attr_col = getattr(self.table, col)
-            item_col = self.table[col]
-            self.assertEqual(id(attr_col), id(item_col))
+        table = self.table
+        cols = table.columns
+        get_col_objs = {col: table._get_col(column=col) for col in cols}
+        self.assertEqual([col_obj.name for col_obj in get_col_objs.values()], cols)
 
-            self.assertEqual(id(col_obj), id(attr_col))
+        # compare the ids, since Column.__eq__() returns an Expression
+        get_col_ids = {col: id(col_obj) for col, col_obj in get_col_objs.items()}
+        self.assertEqual({col: id(getattr(table, col)) for col in cols}, get_col_ids)
+        self.assertEqual({col: id(table[col]) for col in cols}, get_col_ids)
 
     def test_column_slice(self):
         for _ in range(3):
@@ -406,7 +491,7 @@ class TestTable(unittest.TestCase):
         self.assertIsInstance(hash(self.table), int)
 
     def test_repr_df(self):
-        for _, table in self.db.items():
+        for table in tables_to_test(self.db):
             df = table._repr_df()
             self.assertIsInstance(df, DataFrame)
             self.assertEqual(len(df), 20)
@@ -435,21 +520,7 @@ class TestTable(unittest.TestCase):
         self.assertTrue(db.regions.equals(db.regions.limit(10000)))
 
 
-class TestTableView(unittest.TestCase):
-    def setUp(self) -> None:
-        self.db = Database(MAIN_DATABASE, cache=False)
-        self.table: Table = self.db[self.db.tables[0]]
-
-        tables = self.db.tables
-        self.assertGreaterEqual(len(tables), MIN_TABLES,
-                                msg='Database must have at least one table for the tests')
-
-        self.assertGreaterEqual(len(self.table.columns), MIN_COLUMNS,
-                                msg='Database must have at least 3 columns in the first table for the tests')
-
-    def tearDown(self) -> None:
-        self.db.exit()
-
+class TestTableView(TableTestCase):
     def test_columns(self):
         table: Table = self.db.regions
         table_view = table.limit(10)
@@ -461,12 +532,14 @@ class TestTableView(unittest.TestCase):
 
         nested_view = table_view.limit(10)
         self.assertIsInstance(table_view, TableView)
-        self.assertNotIn(member='_rowid_', container=nested_view.columns)
-        self.assertNotIn(member='rowid', container=nested_view.columns)
-        self.assertEqual(nested_view.columns, table.columns)
+        nested_cols = nested_view.columns
+        self.assertNotIn(member='_rowid_', container=nested_cols)
+        self.assertNotIn(member='rowid', container=nested_cols)
+        self.assertEqual(nested_cols, table_cols)
 
         nested_view = nested_view.limit(10)
         self.assertIsInstance(table_view, TableView)
-        self.assertNotIn(member='_rowid_', container=nested_view.columns)
-        self.assertNotIn(member='rowid', container=nested_view.columns)
-        self.assertEqual(nested_view.columns, table.columns)
+        nested_cols = nested_view.columns
+        self.assertNotIn(member='_rowid_', container=nested_cols)
+        self.assertNotIn(member='rowid', container=nested_cols)
+        self.assertEqual(nested_cols, table_cols)
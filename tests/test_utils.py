@@ -1,7 +1,10 @@
 import unittest
+import random
 import sqlite3
 from typing import Any
 
+import numpy as np
+
 from pandasdb.utils import *
 from pandasdb.exceptions import ViewAlreadyExists
 from pandasdb.connection import Database
@@ -11,8 +14,45 @@ DB_FILE = '../data/forestation.db'
 SQL_FILE = '../data/parch-and-posey.sql'
 SQLITE_FILE = '../data/mental_health.sqlite'
 
+is_none = np.frompyfunc(lambda x: x is None, 1, 1)  # element-wise `is None` for object arrays
+
+
+def sql_sorted(it: list) -> list:
+    """
+    Sort the values the same way as SQL's ORDER BY, which puts the null values first
+
+    :param it: list, values of a single type and None
+    :return: list
+    """
+    arr = np.array(it, dtype=object)
+    null_mask = is_none(arr).astype(bool)
+    return arr[null_mask].tolist() + np.sort(arr[~null_mask]).tolist()
+
 
 class TestUtils(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # read-only fixture shared by the tests, the view tests use their own short-lived connections
+        cls.db = Database(DB_FILE)
+
+        # in-memory copy of the database for the view tests, so the queries don't have to read from disk,
+        # it's a named database with a shared cache, so new connections can open the same copy,
+        # and it lives as long as cls.conn is open
+        cls.memory_uri = f'file:test_utils_{get_random_name()}?mode=memory&cache=shared'
+        src = sqlite3.connect(DB_FILE)
+        cls.conn = sqlite3.connect(cls.memory_uri, uri=True)
+        src.backup(cls.conn)
+        src.close()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.db.exit()
+        cls.conn.close()
+
+    def connect_memory(self) -> sqlite3.Connection:
+        """ Return a new connection to the in-memory copy of the database """
+        return sqlite3.connect(self.memory_uri, uri=True)
+
     def test_convert_type_to_sql(self):
         self.assertEqual(convert_type_to_sql('jake snake'), "'jake snake'")
         self.assertEqual(convert_type_to_sql(394), '394')
@@ -28,7 +68,7 @@ class TestUtils(unittest.TestCase):
             )
 
     def test_col_iterator(self):
-        db = Database(DB_FILE)
+        db = self.db
 
         for col in col_iterator(db=db, numeric_only=False):
             self.assertIsInstance(col, Column)
@@ -41,7 +81,6 @@ class TestUtils(unittest.TestCase):
         numeric_cols = list(col_iterator(db=db, numeric_only=True))
         self.assertNotEqual(len(all_cols), len(numeric_cols))
         self.assertLess(len(numeric_cols), len(all_cols))
-        db.exit()
 
     def test_sql_tuple(self):
         out = sql_tuple(('jake', 32.2, True, 'new york'))
@@ -51,36 +90,40 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(out, '(false)')
 
     def test_get_random_name(self):
-        out = get_random_name(5)
-        self.assertIsInstance(out, str)
-        self.assertTrue(out.islower())
-        self.assertEqual(len(out), 5)
+        # seed the generator so the test is deterministic, and restore its state for the other tests
+        self.addCleanup(random.setstate, random.getstate())
+        random.seed(0)
+
+        for size in (1, 5, 32):
+            with self.subTest(size=size):
+                out = get_random_name(size)
+                self.assertIsInstance(out, str)
+                self.assertTrue(out.islower())
+                self.assertEqual(len(out), size)
 
         # assert set doesn't shrink in size (all elements unique)
-        random_names = {
-            get_random_name(), get_random_name(),
-            get_random_name(), get_random_name(),
-            get_random_name(), get_random_name()
-        }
+        random_names = {get_random_name() for _ in range(6)}
         self.assertEqual(len(random_names), 6)
 
     def test_create_temp_view(self):
-        def get_temp_views() -> list:
+        def has_temp_view(view_name: str) -> bool:
             with conn as cursor:
-                return [x[0] for x in cursor.execute("SELECT name FROM sqlite_temp_master WHERE type='view'")]
+                query = "SELECT 1 FROM sqlite_temp_master WHERE type='view' AND name = ?"
+                return cursor.execute(query, (view_name,)).fetchone() is not None
 
-        conn = sqlite3.connect(DB_FILE)
+        conn = self.connect_memory()
         name = f'test_view_{get_random_name()}'
         query = 'SELECT * FROM forest_area LIMIT 50'
 
-        self.assertNotIn(member=name, container=get_temp_views())
+        self.assertFalse(has_temp_view(name))
         create_temp_view(conn=conn, view_name=name, query=query, drop_if_exists=False)
-        self.assertIn(member=name, container=get_temp_views())
+        self.assertTrue(has_temp_view(name))
         conn.close()
 
         # after closing the connection the TEMP-VIEW should auto-delete
-        conn = sqlite3.connect(DB_FILE)
-        self.assertNotIn(member=name, container=get_temp_views())
+        conn = self.connect_memory()
+        self.addCleanup(conn.close)
+        self.assertFalse(has_temp_view(name))
 
         create_temp_view(conn=conn, view_name=name, query=query, drop_if_exists=False)
         with conn as cur:
@@ -94,35 +137,28 @@ class TestUtils(unittest.TestCase):
             create_temp_view, conn=conn, view_name=name, query=query, drop_if_exists=False
         )
 
-        self.assertIn(member=name, container=get_temp_views())
+        self.assertTrue(has_temp_view(name))
         create_temp_view(conn=conn, view_name=name, query=query, drop_if_exists=True)
-        self.assertIn(member=name, container=get_temp_views())
+        self.assertTrue(has_temp_view(name))
 
     def test_concat(self):
         first = ['jake', 'carla', 'francis', 'john']
         last = ['snake', 'louie', 'ngannou', 'cash']
         out = ['jake snake',  'carla louie', 'francis ngannou', 'john cash']
 
-        # make sure each element is as expected, and both iterables have the same length (with strict=True)
-        it = concat(first, ' ', last)
-        for a, b in zip(it, out, strict=True):
-            self.assertIsInstance(a, str)
-            self.assertEqual(a, b)
+        # comparing the lists checks each element, and that both iterables have the same length
+        result = list(concat(first, ' ', last))
+        self.assertIsInstance(result[0], str)
+        self.assertEqual(result, out)
 
-        it = concat(first, last, sep=' ')
-        for a, b in zip(it, out, strict=True):
-            self.assertEqual(a, b)
+        self.assertEqual(list(concat(first, last, sep=' ')), out)
 
         ages = [32, 19, 30, 53]
         out = ['jake snake - 32',  'carla louie - 19', 'francis ngannou - 30', 'john cash - 53']
-        it = concat(first, ' ', last, ' - ', ages)
-        for a, b in zip(it, out, strict=True):
-            self.assertEqual(a, b)
+        self.assertEqual(list(concat(first, ' ', last, ' - ', ages)), out)
 
         out = ['jake snake 32',  'carla louie 19', 'francis ngannou 30', 'john cash 53']
-        it = concat(first, last, ages, sep=' ')
-        for a, b in zip(it, out, strict=True):
-            self.assertEqual(a, b)
+        self.assertEqual(list(concat(first, last, ages, sep=' ')), out)
 
     def test_sort_iterable_with_none_values(self):
         # simulate SQL columns that have a certain data type (str, int, bool) and contain null values
@@ -131,17 +167,13 @@ class TestUtils(unittest.TestCase):
             'str': [None, 'a', 'z', 'b', None, 'y', None],
             'bool': [None, True, True, None, False, None]
         }
-        out = sort_iterable_with_none_values(lists['int'])
-        sql_sorted = [None, None, None, -40, -3, 2, 4, 90]  # sql will put None values first
-        self.assertEqual(out, sql_sorted)
-
-        out = sort_iterable_with_none_values(lists['str'])
-        sql_sorted = [None, None, None, 'a', 'b', 'y', 'z']
-        self.assertEqual(out, sql_sorted)
+        # sql will put None values first
+        self.assertEqual(sql_sorted(lists['int']), [None, None, None, -40, -3, 2, 4, 90])
 
-        out = sort_iterable_with_none_values(lists['bool'])
-        sql_sorted = [None, None, None, False, True, True]
-        self.assertEqual(out, sql_sorted)
+        for dtype, lst in lists.items():
+            with self.subTest(dtype=dtype):
+                out = sort_iterable_with_none_values(lst)
+                self.assertEqual(out, sql_sorted(lst))
 
     def test_get_mb_size(self):
         pass